@@ -1,8 +1,8 @@
-import json
 import os
 import keyring
+import orjson
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 from transactions_core.security import Encryptor
 
 APP_NAME = "transactions-cli"
@@ -13,8 +13,27 @@ KEYRING_USERNAME = "master-key"
 CONFIG_DIR = Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config")) / APP_NAME
 CONFIG_FILE = CONFIG_DIR / "config.json"
 
+# Process-wide cache so the keyring is only queried once per CLI invocation
+_ENCRYPTOR: Optional[Encryptor] = None
+
 
 def _get_encryptor() -> Encryptor:
+    """
+    Returns the cached Encryptor, loading it from the keyring on first use.
+    """
+    global _ENCRYPTOR
+    if _ENCRYPTOR is None:
+        _ENCRYPTOR = _load_encryptor()
+    return _ENCRYPTOR
+
+
+def _reset_encryptor():
+    """Drops the cached Encryptor so the next call re-reads the keyring."""
+    global _ENCRYPTOR
+    _ENCRYPTOR = None
+
+
+def _load_encryptor() -> Encryptor:
     """
     Retrieves the encryption key from the OS System Keyring (Keychain/CredMgr).
     If no key exists, generates one and saves it to the Keyring.
@@ -54,15 +73,16 @@ def get_config() -> Dict:
 
     try:
         encryptor = _get_encryptor()
-        with open(CONFIG_FILE, "r") as f:
-            data = json.load(f)
+        data = orjson.loads(CONFIG_FILE.read_bytes())
 
         # Decrypt the payload if it exists
         if "payload" in data and isinstance(data["payload"], dict):
-            for k, v in data["payload"].items():
-                if isinstance(v, str):
-                    # Attempt to decrypt; if it fails (wrong key), keep original
-                    data["payload"][k] = encryptor.decrypt(v)
+            payload = data["payload"]
+            keys = [k for k, v in payload.items() if isinstance(v, str)]
+            # Attempt to decrypt; if it fails (wrong key), keep original
+            payload.update(
+                zip(keys, encryptor.decrypt_many([payload[k] for k in keys]))
+            )
 
         return data
     except Exception:
@@ -78,14 +98,12 @@ def save_config(provider_name: str, payload: Dict):
     encryptor = _get_encryptor()
 
     # Create a copy to encrypt
-    secure_payload = {}
-    for k, v in payload.items():
-        if isinstance(v, str):
-            secure_payload[k] = encryptor.encrypt(v)
-        else:
-            secure_payload[k] = v
+    secure_payload = dict(payload)
+    keys = [k for k, v in payload.items() if isinstance(v, str)]
+    secure_payload.update(
+        zip(keys, encryptor.encrypt_many([payload[k] for k in keys]))
+    )
 
     data = {"provider": provider_name, "payload": secure_payload}
 
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    CONFIG_FILE.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
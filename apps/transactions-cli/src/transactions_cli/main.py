@@ -4,7 +4,7 @@ import orjson
 from rich.console import Console
 from rich.table import Table
 from rich import print as rprint
-from dataclasses import asdict
+from decimal import Decimal
 
 from transactions_core import SimpleFinProvider
 
@@ -13,6 +13,8 @@ from . import config, factory
 app = typer.Typer(help="Financial Transactions CLI")
 console = Console()
 
+DATE_FORMAT = "%Y-%m-%d"
+
 
 async def _fetch_data(action: str, **kwargs):
     """Generic helper to run provider actions."""
@@ -33,6 +35,22 @@ async def _fetch_data(action: str, **kwargs):
             await provider.close()
 
 
+def _json_default(obj):
+    """orjson handles dataclasses and datetimes natively; only Decimals need help."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+def _dump_json(data: dict) -> str:
+    return orjson.dumps(data, default=_json_default).decode()
+
+
+def _format_amount(amount) -> str:
+    color = "red" if amount < 0 else "green"
+    return f"[{color}]${amount:,.2f}[/{color}]"
+
+
 # --- Commands ---
 
 
@@ -49,7 +67,7 @@ def setup(
         if provider == "simplefin":
             with console.status("[green]Exchanging token with SimpleFin..."):
                 # SimpleFin specific setup logic
-                access_url = SimpleFinProvider.claim_token(token)
+                access_url = SimpleFinProvider.claim_token_sync(token)
 
             config.save_config("simplefin", {"access_url": access_url})
             rprint("[bold green]Success![/bold green] SimpleFin configured.")
@@ -69,8 +87,7 @@ def accounts(json_out: bool = typer.Option(False, "--json")):
     data, errors = asyncio.run(_fetch_data("accounts"))
 
     if json_out:
-        output = {"accounts": [asdict(a) for a in data], "errors": errors}
-        print(orjson.dumps(output).decode())
+        print(_dump_json({"accounts": data, "errors": errors}))
         return
 
     if errors:
@@ -81,8 +98,9 @@ def accounts(json_out: bool = typer.Option(False, "--json")):
     table.add_column("Name", style="white")
     table.add_column("Balance", justify="right", style="green")
 
-    for acc in data:
-        table.add_row(acc.org_name, acc.name, f"${acc.balance:,.2f}")
+    rows = [(acc.org_name, acc.name, f"${acc.balance:,.2f}") for acc in data]
+    for row in rows:
+        table.add_row(*row)
     console.print(table)
 
 
@@ -95,15 +113,7 @@ def view(
     data, errors = asyncio.run(_fetch_data("transactions", days=days))
 
     if json_out:
-        # Convert data for JSON (dates/decimals need casting)
-        clean_data = []
-        for t in data:
-            d = asdict(t)
-            d["amount"] = float(d["amount"])
-            d["date"] = d["date"].isoformat()
-            clean_data.append(d)
-
-        print(orjson.dumps({"transactions": clean_data, "errors": errors}).decode())
+        print(_dump_json({"transactions": data, "errors": errors}))
         return
 
     if errors:
@@ -114,11 +124,11 @@ def view(
     table.add_column("Payee")
     table.add_column("Amount", justify="right")
 
-    for t in data:
-        color = "red" if t.amount < 0 else "green"
-        table.add_row(
-            t.date.strftime("%Y-%m-%d"), t.payee, f"[{color}]${t.amount:,.2f}[/{color}]"
-        )
+    rows = [
+        (t.date.strftime(DATE_FORMAT), t.payee, _format_amount(t.amount)) for t in data
+    ]
+    for row in rows:
+        table.add_row(*row)
     console.print(table)
 
 
@@ -1,27 +1,48 @@
+import asyncio
+import os
 import secrets
+import threading
+import bcrypt
 from fastapi import Request, Depends, HTTPException, status, Form
 from sqlmodel import Session, select
-from passlib.context import CryptContext
 from .db import get_session, User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+def _hash(password: str) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
 
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    except ValueError:
+        # Malformed hash in the DB
+        return False
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+
+# bcrypt is CPU-bound; run it in a worker thread to keep the event loop free
+async def get_password_hash(password: str) -> str:
+    return await asyncio.to_thread(_hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.to_thread(_verify, plain_password, hashed_password)
 
 
 async def get_current_user(
     request: Request, session: Session = Depends(get_session)
 ) -> User:
+    # Reuse the lookup if it already ran during this request
+    user = getattr(request.state, "current_user", None)
+    if user is not None:
+        return user
+
     username = request.session.get("user")
     if not username:
         return None
-    return session.exec(select(User).where(User.username == username)).first()
+    user = session.exec(select(User).where(User.username == username)).first()
+    request.state.current_user = user
+    return user
 
 
 async def require_user(
@@ -35,6 +56,34 @@ async def require_user(
     return user
 
 
+# CSRF tokens are sliced from a pool of random bytes refilled 4KB at a time,
+# so only one urandom syscall is made per 128 tokens.
+_TOKEN_BYTES = 32
+_TOKEN_POOL_REFILL = 4096
+_token_pool = bytearray()
+_token_pool_lock = threading.Lock()
+
+
+def _reset_token_pool():
+    # A forked worker (e.g. gunicorn --preload) must not reuse the parent's
+    # pooled bytes, or every worker would issue the same tokens.
+    global _token_pool_lock
+    _token_pool.clear()
+    _token_pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_token_pool)
+
+
+def new_csrf_token() -> str:
+    with _token_pool_lock:
+        if len(_token_pool) < _TOKEN_BYTES:
+            _token_pool.extend(os.urandom(_TOKEN_POOL_REFILL))
+        token = _token_pool[:_TOKEN_BYTES].hex()
+        del _token_pool[:_TOKEN_BYTES]
+    return token
+
+
 async def validate_csrf(request: Request, csrf_token: str = Form(...)):
     session_token = request.session.get("csrf_token")
     if not session_token or not secrets.compare_digest(session_token, csrf_token):
@@ -43,7 +92,7 @@ async def validate_csrf(request: Request, csrf_token: str = Form(...)):
 
 def login_user(request: Request, username: str):
     request.session["user"] = username
-    request.session["csrf_token"] = secrets.token_hex(32)
+    request.session["csrf_token"] = new_csrf_token()
 
 
 def logout_user(request: Request):
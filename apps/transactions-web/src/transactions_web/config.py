@@ -1,4 +1,5 @@
 import os
+from functools import cached_property
 from pathlib import Path
 from transactions_core.security import Encryptor
 
@@ -11,6 +12,9 @@ class Settings:
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 30  # 30 days
 
+    # Development (reloads templates from disk when they change)
+    DEBUG: bool = os.getenv("DEBUG", "").lower() in ("1", "true", "yes")
+
     # Persistence
     # Use standard user data directory: ~/.local/share/transactions-web (Linux/Mac)
     APP_NAME = "transactions-web"
@@ -24,8 +28,8 @@ class Settings:
         self.DATA_DIR.mkdir(parents=True, exist_ok=True)
         return f"sqlite:///{self.DATA_DIR}/app.db"
 
-    # Encryption (Derived from SECRET_KEY)
-    @property
+    # Encryption (Derived from SECRET_KEY, once per process)
+    @cached_property
     def encryptor(self) -> Encryptor:
         return Encryptor.from_secret(self.SECRET_KEY)
 
@@ -2,7 +2,7 @@ from typing import Optional
 from datetime import datetime
 from decimal import Decimal
 from sqlmodel import SQLModel, Field, create_engine, Session, Relationship
-from sqlalchemy import Column, Numeric
+from sqlalchemy import Column, Index, Numeric, event
 from .config import settings
 
 
@@ -30,6 +30,11 @@ class Connection(SQLModel, table=True):
 
 
 class CachedAccount(SQLModel, table=True):
+    # Upsert target for incremental sync
+    __table_args__ = (
+        Index("uq_acct_ext", "connection_id", "external_id", unique=True),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     connection_id: int = Field(foreign_key="connection.id", index=True)
     external_id: str
@@ -43,8 +48,15 @@ class CachedAccount(SQLModel, table=True):
 
 
 class CachedTransaction(SQLModel, table=True):
+    # Upsert target for incremental sync; its connection_id prefix also serves
+    # lookups and deletes by connection. The dashboard filters through the
+    # Connection join, so ORDER BY date is a sort either way.
+    __table_args__ = (
+        Index("uq_txn_ext", "connection_id", "external_id", unique=True),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    connection_id: int = Field(foreign_key="connection.id", index=True)
+    connection_id: int = Field(foreign_key="connection.id")
     external_id: str
     date: datetime
     # Use Numeric for precision
@@ -60,9 +72,47 @@ class CachedTransaction(SQLModel, table=True):
 engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
 
 
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets dashboard reads proceed while a sync is writing,
+    # and synchronous=NORMAL drops the extra fsync per commit.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-20000")
+    cursor.close()
+
+
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
 
+    # create_all skips indexes on tables that already exist, so migrate manually
+    with engine.begin() as conn:
+        # Superseded by uq_txn_ext, which leads with connection_id
+        conn.exec_driver_sql("DROP INDEX IF EXISTS ix_txn_conn_date")
+        conn.exec_driver_sql("DROP INDEX IF EXISTS ix_cachedtransaction_connection_id")
+
+        # Unique upsert targets; drop duplicate cache rows first so they can build
+        for table, index in (
+            ("cachedtransaction", "uq_txn_ext"),
+            ("cachedaccount", "uq_acct_ext"),
+        ):
+            if conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+                (index,),
+            ).first():
+                continue
+            conn.exec_driver_sql(
+                f"DELETE FROM {table} WHERE id NOT IN "
+                f"(SELECT MIN(id) FROM {table} GROUP BY connection_id, external_id)"
+            )
+            conn.exec_driver_sql(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {index} "
+                f"ON {table} (connection_id, external_id)"
+            )
+
 
 def get_session():
     with Session(engine) as session:
@@ -1,14 +1,21 @@
 from contextlib import asynccontextmanager
 from itertools import groupby
 from datetime import datetime
-import secrets
+import httpx
 import uvicorn
 from fastapi import FastAPI, Depends, Request, Form, status, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse
+from fastapi.responses import (
+    HTMLResponse,
+    RedirectResponse,
+    FileResponse,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 from starlette.middleware.sessions import SessionMiddleware
-from sqlmodel import Session, select
+from sqlalchemy.orm import load_only
+from sqlmodel import Session, select, func
 from pathlib import Path
 
 from .db import create_db_and_tables, get_session, User, Connection
@@ -19,7 +26,13 @@ from .config import settings
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
-    yield
+    warm_templates()
+    # Shared client keeps TLS connections to SimpleFin warm across syncs
+    async with httpx.AsyncClient(
+        timeout=30.0, limits=httpx.Limits(max_keepalive_connections=20)
+    ) as client:
+        app.state.http_client = client
+        yield
 
 
 app = FastAPI(lifespan=lifespan)
@@ -30,6 +43,12 @@ app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY, https_only
 BASE_DIR = Path(__file__).resolve().parent
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 
+# Persist compiled templates across restarts; only re-check sources in debug
+JINJA_CACHE_DIR = settings.DATA_DIR / "jinja_cache"
+JINJA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+templates.env.auto_reload = settings.DEBUG
+templates.env.bytecode_cache = FileSystemBytecodeCache(str(JINJA_CACHE_DIR))
+
 static_dir = BASE_DIR / "static"
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
@@ -74,17 +93,50 @@ templates.env.filters["month"] = format_month
 
 
 # --- Dependencies & Helpers ---
-def render(request: Request, name: str, context: dict = {}):
+def warm_templates():
+    """Compile every template up front so first requests skip parsing."""
+    for name in templates.env.list_templates():
+        templates.env.get_template(name)
+
+
+def _template_context(request: Request, context: dict) -> dict:
     if not request.session.get("csrf_token"):
-        request.session["csrf_token"] = secrets.token_hex(32)
-    ctx = {
+        request.session["csrf_token"] = auth.new_csrf_token()
+    return {
         "request": request,
         "user": request.session.get("user"),
         "csrf_token": request.session.get("csrf_token", ""),
         "flash_error": request.session.pop("flash_error", None),
         **context,
     }
-    return templates.TemplateResponse(name, ctx)
+
+
+def render(request: Request, name: str, context: dict = {}):
+    return templates.TemplateResponse(name, _template_context(request, context))
+
+
+# Rendered template output is flushed to the client in chunks of this size
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+def _chunked(parts, size: int = STREAM_CHUNK_SIZE):
+    # Jinja yields many tiny strings; group them to avoid one send per fragment
+    buf, buffered = [], 0
+    for part in parts:
+        buf.append(part)
+        buffered += len(part)
+        if buffered >= size:
+            yield "".join(buf)
+            buf, buffered = [], 0
+    if buf:
+        yield "".join(buf)
+
+
+def render_stream(request: Request, name: str, context: dict = {}):
+    """Like render(), but streams the HTML as it is generated (for large lists)."""
+    template = templates.get_template(name)
+    ctx = _template_context(request, context)
+    return StreamingResponse(_chunked(template.generate(ctx)), media_type="text/html")
 
 
 def group_transactions(txns):
@@ -113,7 +165,8 @@ async def register(
     if session.exec(select(User).where(User.username == username)).first():
         return render(request, "register.html", {"error": "Username taken"})
 
-    user = User(username=username, hashed_password=auth.get_password_hash(password))
+    hashed_password = await auth.get_password_hash(password)
+    user = User(username=username, hashed_password=hashed_password)
     session.add(user)
     session.commit()
 
@@ -134,7 +187,7 @@ async def login(
     session: Session = Depends(get_session),
 ):
     user = session.exec(select(User).where(User.username == username)).first()
-    if not user or not auth.verify_password(password, user.hashed_password):
+    if not user or not await auth.verify_password(password, user.hashed_password):
         return render(request, "login.html", {"error": "Invalid credentials"})
 
     auth.login_user(request, user.username)
@@ -153,11 +206,13 @@ async def dashboard(
     user: User = Depends(auth.require_user),
     session: Session = Depends(get_session),
 ):
-    # 1. Check for connections
-    connections = session.exec(
-        select(Connection).where(Connection.user_id == user.id)
-    ).all()
-    has_conn = bool(connections)
+    # 1. Check for connections (aggregates only, no row hydration)
+    conn_count, latest_sync = session.exec(
+        select(func.count(Connection.id), func.max(Connection.last_synced_at)).where(
+            Connection.user_id == user.id
+        )
+    ).one()
+    has_conn = conn_count > 0
 
     # 2. Load CACHED data immediately
     txns, errors = await service.get_dashboard_data(session, user.id)
@@ -165,13 +220,10 @@ async def dashboard(
 
     # Calculate last sync time for display
     last_synced = "Never"
-    if connections:
-        # Find the most recent sync time
-        times = [c.last_synced_at for c in connections if c.last_synced_at]
-        if times:
-            last_synced = max(times).strftime("%I:%M %p")
+    if latest_sync:
+        last_synced = latest_sync.strftime("%I:%M %p")
 
-    return render(
+    return render_stream(
         request,
         "dashboard.html",
         {
@@ -195,10 +247,12 @@ async def transactions_sync(
     2. Updates Cache.
     3. Returns rendered rows.
     """
-    txns, errors = await service.sync_data(session, user.id)
+    txns, errors = await service.sync_data(
+        session, user.id, client=request.app.state.http_client
+    )
     grouped = group_transactions(txns)
 
-    return render(
+    return render_stream(
         request,
         "partials/transaction_rows.html",
         {
@@ -215,8 +269,11 @@ async def settings_page(
     user: User = Depends(auth.require_user),
     session: Session = Depends(get_session),
 ):
+    # The template only needs connection ids; skip loading the encrypted URLs
     connections = session.exec(
-        select(Connection).where(Connection.user_id == user.id)
+        select(Connection)
+        .where(Connection.user_id == user.id)
+        .options(load_only(Connection.id))
     ).all()
 
     # FETCH ACCOUNTS IMMEDIATELY (Cache-First)
@@ -250,7 +307,9 @@ async def connect_bank(
     session: Session = Depends(get_session),
 ):
     try:
-        await service.add_connection(session, user.id, token)
+        await service.add_connection(
+            session, user.id, token, client=request.app.state.http_client
+        )
     except Exception as e:
         request.session["flash_error"] = f"Connection failed: {str(e)}"
     return RedirectResponse("/settings", status_code=303)
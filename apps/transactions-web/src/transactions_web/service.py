@@ -1,16 +1,25 @@
 import asyncio
 import httpx
+from contextlib import nullcontext
 from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import delete, or_
+from sqlalchemy.dialects.sqlite import insert
 from sqlmodel import Session, select
 from transactions_core import SimpleFinProvider
-from .db import Connection, CachedAccount, CachedTransaction
+from .db import engine, Connection, CachedAccount, CachedTransaction
 from .config import settings
 
 
-async def add_connection(session: Session, user_id: int, token: str):
+async def add_connection(
+    session: Session,
+    user_id: int,
+    token: str,
+    client: Optional[httpx.AsyncClient] = None,
+):
     """Exchanges token using Core and saves encrypted URL to DB."""
     # 1. Exchange token for real URL
-    raw_access_url = SimpleFinProvider.claim_token(token)
+    raw_access_url = await SimpleFinProvider.claim_token(token, client=client)
 
     # 2. Encrypt URL before storage
     encrypted_url = settings.encryptor.encrypt(raw_access_url)
@@ -20,7 +29,7 @@ async def add_connection(session: Session, user_id: int, token: str):
     session.commit()
 
     # 3. Trigger an immediate initial sync so the user sees data
-    await sync_data(session, user_id)
+    await sync_data(session, user_id, client=client)
 
 
 async def get_dashboard_data(session: Session, user_id: int):
@@ -36,18 +45,8 @@ async def get_dashboard_data(session: Session, user_id: int):
         .order_by(CachedTransaction.date.desc())
     )
     transactions = session.exec(statement).all()
-
-    # Check if we have any connections that have never been synced
-    connections = session.exec(
-        select(Connection).where(Connection.user_id == user_id)
-    ).all()
     errors = []
 
-    # Simple check to warn if data might be stale (optional logic)
-    if connections and not transactions:
-        # If we have connections but no data, it's likely a sync hasn't finished yet
-        pass
-
     return transactions, errors
 
 
@@ -73,9 +72,142 @@ async def get_accounts(session: Session, user_id: int):
     ]
 
 
-async def sync_data(session: Session, user_id: int):
+def _transaction_row(connection_id: int, t) -> dict:
+    return {
+        "connection_id": connection_id,
+        "external_id": t.id,
+        "date": t.date,
+        "amount": t.amount,
+        "payee": t.payee,
+        "description": t.description,
+        "account_name": t.account_name,
+        "org_name": t.org_name,
+    }
+
+
+def _account_row(connection_id: int, a) -> dict:
+    return {
+        "connection_id": connection_id,
+        "external_id": a.id,
+        "name": a.name,
+        "org_name": a.org_name,
+        "currency": a.currency,
+        "balance": a.balance,
+    }
+
+
+def _upsert(model, columns: tuple):
+    """
+    INSERT ... ON CONFLICT DO UPDATE keyed on (connection_id, external_id).
+    Rows whose values are unchanged are left untouched.
+    """
+    stmt = insert(model)
+    table = model.__table__
+    return stmt.on_conflict_do_update(
+        index_elements=["connection_id", "external_id"],
+        set_={c: stmt.excluded[c] for c in columns},
+        where=or_(*[table.c[c].is_distinct_from(stmt.excluded[c]) for c in columns]),
+    )
+
+
+_TRANSACTION_UPSERT = _upsert(
+    CachedTransaction,
+    ("date", "amount", "payee", "description", "account_name", "org_name"),
+)
+_ACCOUNT_UPSERT = _upsert(CachedAccount, ("name", "org_name", "currency", "balance"))
+
+
+async def _fetch_transaction_rows(
+    connection_id: int, provider: SimpleFinProvider, errors: List[str]
+) -> List[dict]:
+    return [
+        _transaction_row(connection_id, t)
+        async for t in provider.iter_transactions(days=60, errors=errors)
+    ]
+
+
+async def _persist(connection_id: int, provider: SimpleFinProvider) -> List[str]:
+    """
+    Fetch one connection's data and sync its cache in its own Session.
+    Returns the error messages for this connection.
+    """
+    errors = []
+
+    # Fetch BOTH transactions and accounts in parallel
+    txns_res, accounts_res = await asyncio.gather(
+        _fetch_transaction_rows(connection_id, provider, errors),
+        provider.fetch_accounts(),
+        return_exceptions=True,
+    )
+
+    # Handle Transaction Errors (the provider raises ProviderError when the
+    # fetch fails; keep the old cache rather than wiping it)
+    if isinstance(txns_res, Exception):
+        errors.append(f"Conn {connection_id} Txn Error: {str(txns_res)}")
+        return errors
+    rows = txns_res
+
+    # Handle Account Errors (fetch_accounts raises on a failed fetch; likewise,
+    # leave cached accounts as they are)
+    account_rows = None
+    if isinstance(accounts_res, Exception):
+        errors.append(f"Conn {connection_id} Acct Error: {str(accounts_res)}")
+    else:
+        accounts, a_errs = accounts_res
+        if a_errs:
+            errors.extend(a_errs)
+        account_rows = [_account_row(connection_id, a) for a in accounts]
+
+    # --- DATABASE UPSERT & PRUNE ---
+    # No awaits past this point: SQLite allows a single writer, so each
+    # connection's write transaction must run to completion without yielding.
+    with Session(engine) as session:
+        try:
+            conn = session.get(Connection, connection_id)
+            conn.last_synced_at = datetime.now()
+            session.add(conn)
+
+            # 1. Upsert Transactions, then drop the ones no longer returned
+            if rows:
+                session.exec(_TRANSACTION_UPSERT, params=rows)
+            session.exec(
+                delete(CachedTransaction).where(
+                    CachedTransaction.connection_id == connection_id,
+                    CachedTransaction.external_id.not_in(
+                        [r["external_id"] for r in rows]
+                    ),
+                )
+            )
+
+            # 2. Same for Accounts
+            if account_rows is not None:
+                if account_rows:
+                    session.exec(_ACCOUNT_UPSERT, params=account_rows)
+                session.exec(
+                    delete(CachedAccount).where(
+                        CachedAccount.connection_id == connection_id,
+                        CachedAccount.external_id.not_in(
+                            [r["external_id"] for r in account_rows]
+                        ),
+                    )
+                )
+
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            errors.append(f"DB Error Conn {connection_id}: {str(e)}")
+
+    return errors
+
+
+async def sync_data(
+    session: Session, user_id: int, client: Optional[httpx.AsyncClient] = None
+):
     """
-    WRITE: Fetches fresh data (Txns AND Accounts), wipes old cache, inserts new.
+    WRITE: Fetches fresh data (Txns AND Accounts) and upserts it into the cache,
+    pruning rows the provider no longer returns.
+    Connections are fetched concurrently, each persisted in its own Session.
+    Pass the app's shared `client` to reuse pooled connections across syncs.
     """
     connections = session.exec(
         select(Connection).where(Connection.user_id == user_id)
@@ -84,100 +216,17 @@ async def sync_data(session: Session, user_id: int):
     all_errors = []
 
     if connections:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with (
+            nullcontext(client) if client else httpx.AsyncClient(timeout=30.0)
+        ) as client:
             tasks = []
             for conn in connections:
                 real_url = settings.encryptor.decrypt(conn.access_url)
                 provider = SimpleFinProvider(real_url, client=client)
-
-                # Fetch BOTH transactions and accounts in parallel
-                t_task = provider.get_transactions(days=60)
-                a_task = provider.get_accounts()
-
-                tasks.append(asyncio.gather(t_task, a_task, return_exceptions=True))
+                tasks.append(_persist(conn.id, provider))
 
             # Wait for all connections
-            results = await asyncio.gather(*tasks)
-
-            for conn, conn_result in zip(connections, results):
-                # Unpack the results (txns_res, accounts_res)
-                # results is a list of lists because of the nested gather
-                txns_res, accounts_res = conn_result
-
-                # Handle Transaction Errors
-                if isinstance(txns_res, Exception):
-                    all_errors.append(f"Conn {conn.id} Txn Error: {str(txns_res)}")
-                    txns = []
-                else:
-                    txns, t_errs = txns_res
-                    if t_errs:
-                        all_errors.extend(t_errs)
-
-                # Handle Account Errors
-                if isinstance(accounts_res, Exception):
-                    all_errors.append(f"Conn {conn.id} Acct Error: {str(accounts_res)}")
-                    accounts = []
-                else:
-                    accounts, a_errs = accounts_res
-                    if a_errs:
-                        all_errors.extend(a_errs)
-
-                # --- DATABASE WIPE & REPLACE ---
-                try:
-                    conn.last_synced_at = datetime.now()
-                    session.add(conn)
-
-                    # 1. Wipe Old Data
-                    session.exec(
-                        select(CachedTransaction).where(
-                            CachedTransaction.connection_id == conn.id
-                        )
-                    ).all()
-                    for t in session.exec(
-                        select(CachedTransaction).where(
-                            CachedTransaction.connection_id == conn.id
-                        )
-                    ).all():
-                        session.delete(t)
-
-                    for a in session.exec(
-                        select(CachedAccount).where(
-                            CachedAccount.connection_id == conn.id
-                        )
-                    ).all():
-                        session.delete(a)
-
-                    # 2. Insert New Transactions
-                    for t in txns:
-                        session.add(
-                            CachedTransaction(
-                                connection_id=conn.id,
-                                external_id=t.id,
-                                date=t.date,
-                                amount=t.amount,
-                                payee=t.payee,
-                                description=t.description,
-                                account_name=t.account_name,
-                                org_name=t.org_name,
-                            )
-                        )
-
-                    # 3. Insert New Accounts
-                    for a in accounts:
-                        session.add(
-                            CachedAccount(
-                                connection_id=conn.id,
-                                external_id=a.id,
-                                name=a.name,
-                                org_name=a.org_name,
-                                currency=a.currency,
-                                balance=a.balance,
-                            )
-                        )
-
-                    session.commit()
-                except Exception as e:
-                    session.rollback()
-                    all_errors.append(f"DB Error Conn {conn.id}: {str(e)}")
+            for errors in await asyncio.gather(*tasks):
+                all_errors.extend(errors)
 
     return await get_dashboard_data(session, user_id)
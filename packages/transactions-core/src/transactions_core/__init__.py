@@ -1,5 +1,11 @@
 from .models import Transaction, Account
-from .interfaces import FinancialProvider
+from .interfaces import FinancialProvider, ProviderError
 from .providers.simplefin import SimpleFinProvider
 
-__all__ = ["Transaction", "Account", "FinancialProvider", "SimpleFinProvider"]
+__all__ = [
+    "Transaction",
+    "Account",
+    "FinancialProvider",
+    "ProviderError",
+    "SimpleFinProvider",
+]
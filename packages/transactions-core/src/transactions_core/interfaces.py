@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 from datetime import datetime
 from .models import Transaction, Account
 
 
+class ProviderError(Exception):
+    """The fetch itself failed (network, bad response), as opposed to no data."""
+
+
 class FinancialProvider(ABC):
     @abstractmethod
     async def get_accounts(self) -> Tuple[List[Account], List[str]]:
@@ -12,7 +16,32 @@ class FinancialProvider(ABC):
 
     @abstractmethod
     async def get_transactions(
-        self, start_date: Optional[datetime] = None, days: int = 30
+        self,
+        start_date: Optional[datetime] = None,
+        days: int = 30,
+        limit: Optional[int] = None,
     ) -> Tuple[List[Transaction], List[str]]:
-        """Fetch transactions. Returns (transactions, error_messages)."""
+        """
+        Fetch transactions, newest first. Returns (transactions, error_messages).
+        If `limit` is set, only the `limit` most recent are returned.
+        """
         pass
+
+    async def iter_transactions(
+        self,
+        start_date: Optional[datetime] = None,
+        days: int = 30,
+        errors: Optional[List[str]] = None,
+    ) -> AsyncIterator[Transaction]:
+        """
+        Stream transactions one at a time. Error messages are appended to `errors`.
+        Providers that can parse incrementally should override this, and raise
+        ProviderError when the fetch fails so callers can keep stale data.
+        """
+        transactions, errs = await self.get_transactions(
+            start_date=start_date, days=days
+        )
+        if errors is not None:
+            errors.extend(errs)
+        for t in transactions:
+            yield t
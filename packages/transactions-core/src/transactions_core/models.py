@@ -1,10 +1,63 @@
+import functools
+import numbers
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple
 
+# Shared stand-in for a missing "org" object; only ever read
+_EMPTY: dict = {}
 
-@dataclass
+
+def _parse_posted(posted) -> datetime:
+    # numbers.Number also covers the Decimals produced by the ijson parser
+    if isinstance(posted, (numbers.Number, str)):
+        return datetime.fromtimestamp(int(posted))
+    return datetime.now()  # Fallback
+
+
+@functools.lru_cache(maxsize=4096)
+def _decimal_from_str(amount_raw: str) -> Decimal:
+    # Handle string "1,200.50" -> Decimal("1200.50"). str.replace beats a
+    # str.translate table here by ~10x for short amounts and returns the same
+    # object when there is no comma.
+    return Decimal(amount_raw.replace(",", ""))
+
+
+def _parse_amount(amount_raw) -> Decimal:
+    # Amounts repeat a lot (fees, subscriptions) and Decimals are immutable,
+    # so parsed string values are memoized and shared.
+    if isinstance(amount_raw, str):
+        return _decimal_from_str(amount_raw)
+    return Decimal(amount_raw)
+
+
+def _parse_timestamps(posted: list) -> Iterator[datetime]:
+    # SimpleFin sends integer epochs; when the whole column is ints it can be
+    # converted by one C-level map without the per-row type checks.
+    if all(type(p) is int for p in posted):
+        return map(datetime.fromtimestamp, posted)
+    return map(_parse_posted, posted)
+
+
+def _parse_amounts(amounts: list) -> Iterator[Decimal]:
+    # Same idea for amounts, which SimpleFin sends as strings
+    if all(type(a) is str for a in amounts):
+        return map(_decimal_from_str, amounts)
+    return map(_parse_amount, amounts)
+
+
+def _account_context(account: dict) -> Tuple[str, str, str]:
+    """(id, name, org name) of an account dict, shared by its transactions."""
+    org = account.get("org") or _EMPTY
+    return (
+        account.get("id") or "",
+        account.get("name") or "Unknown Account",
+        org.get("name") or "Unknown Bank",
+    )
+
+
+@dataclass(slots=True)
 class Account:
     id: str
     org_name: str
@@ -15,21 +68,17 @@ class Account:
     @classmethod
     def from_dict(cls, data: dict) -> "Account":
         """Factory to safely parse API data into an Account."""
-        balance_raw = data.get("balance", "0")
-        # Handle string "1,200.50" -> Decimal("1200.50")
-        if isinstance(balance_raw, str):
-            balance_raw = balance_raw.replace(",", "")
-
+        org = data.get("org") or _EMPTY
         return cls(
-            id=str(data.get("id")),
-            org_name=data.get("org", {}).get("name", "Unknown Bank"),
-            name=str(data.get("name", "Unknown Account")),
-            currency=str(data.get("currency", "USD")),
-            balance=Decimal(balance_raw),
+            id=data.get("id") or "",
+            org_name=org.get("name") or "Unknown Bank",
+            name=data.get("name") or "Unknown Account",
+            currency=data.get("currency") or "USD",
+            balance=_parse_amount(data.get("balance", "0")),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     id: str
     date: datetime
@@ -46,28 +95,59 @@ class Transaction:
         Factory to safely parse API data into a Transaction.
         Requires the parent account dict to fill in context.
         """
-        # Parse Timestamp
-        posted = data.get("posted")
-        if isinstance(posted, (int, float, str)):
-            date_obj = datetime.fromtimestamp(int(posted))
-        else:
-            date_obj = datetime.now()  # Fallback
-
-        # Parse Amount
-        amount_raw = data.get("amount", "0")
-        if isinstance(amount_raw, str):
-            amount_raw = amount_raw.replace(",", "")
-
-        org_name = account.get("org", {}).get("name", "Unknown Bank")
-        acc_name = account.get("name", "Unknown Account")
+        account_id, acc_name, org_name = _account_context(account)
+        description = data.get("description")
 
         return cls(
-            id=str(data.get("id")),
-            date=date_obj,
-            amount=Decimal(amount_raw),
-            payee=str(data.get("payee") or data.get("description") or "Unknown"),
-            description=data.get("description"),
-            account_id=str(account.get("id")),
+            id=data.get("id") or "",
+            date=_parse_posted(data.get("posted")),
+            amount=_parse_amount(data.get("amount", "0")),
+            payee=data.get("payee") or description or "Unknown",
+            description=description,
+            account_id=account_id,
             account_name=acc_name,
             org_name=org_name,
         )
+
+    @classmethod
+    def from_accounts(cls, accounts: list) -> List["Transaction"]:
+        """
+        Bulk equivalent of from_dict for every transaction under `accounts`.
+        Fields are gathered column by column, then each column is converted
+        with a single map() instead of per-row factory calls.
+        """
+        ids, posted, amounts, payees, descriptions = [], [], [], [], []
+        account_ids, account_names, org_names = [], [], []
+
+        for acc in accounts:
+            txns = acc.get("transactions", [])
+            if not txns:
+                continue
+            for t in txns:
+                description = t.get("description")
+                ids.append(t.get("id") or "")
+                posted.append(t.get("posted"))
+                amounts.append(t.get("amount", "0"))
+                payees.append(t.get("payee") or description or "Unknown")
+                descriptions.append(description)
+
+            # Account context is resolved once per account
+            n = len(txns)
+            account_id, acc_name, org_name = _account_context(acc)
+            account_ids += [account_id] * n
+            account_names += [acc_name] * n
+            org_names += [org_name] * n
+
+        return list(
+            map(
+                cls,
+                ids,
+                _parse_timestamps(posted),
+                _parse_amounts(amounts),
+                payees,
+                account_ids,
+                account_names,
+                org_names,
+                descriptions,
+            )
+        )
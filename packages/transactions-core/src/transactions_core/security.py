@@ -1,7 +1,62 @@
+import asyncio
 import base64
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Tuple
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+
+# Default PBKDF2 work factor. Changing it changes the derived key, so data
+# encrypted with one value can only be decrypted with the same value.
+PBKDF2_ITERATIONS = 480_000
+
+# Below this many values the thread hand-off costs more than the crypto work
+_PARALLEL_MIN_ITEMS = 256
+
+_GCM_NONCE_SIZE = 12
+
+
+@functools.lru_cache(maxsize=32)
+def _derive_key(secret: str, salt: bytes, iterations: int = PBKDF2_ITERATIONS) -> bytes:
+    """
+    PBKDF2 is deliberately slow, so derived keys are memoized per input.
+    """
+    # cryptography ships its own (recent) OpenSSL, which is faster here than
+    # hashlib.pbkdf2_hmac against the system OpenSSL, so it stays the backend.
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=iterations,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(secret.encode()))
+
+
+@functools.lru_cache(maxsize=32)
+def _derive_scrypt_key(secret: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    kdf = Scrypt(salt=salt, length=32, n=n, r=r, p=p)
+    return base64.urlsafe_b64encode(kdf.derive(secret.encode()))
+
+
+# Cipher setup (key decode/split, HKDF) is cached per key, so Encryptors
+# built repeatedly from the same key share their cipher objects.
+@functools.lru_cache(maxsize=8)
+def _make_fernet(key: bytes) -> Fernet:
+    return Fernet(key)
+
+
+@functools.lru_cache(maxsize=8)
+def _make_aesgcm(key: bytes) -> AESGCM:
+    # The GCM key is derived from the Fernet key rather than reusing it
+    gcm_key = HKDF(
+        algorithm=hashes.SHA256(), length=32, salt=None, info=b"aes-256-gcm"
+    ).derive(base64.urlsafe_b64decode(key))
+    return AESGCM(gcm_key)
 
 
 class Encryptor:
@@ -9,23 +64,56 @@ class Encryptor:
         """
         Initialize with a 32-byte URL-safe base64-encoded key.
         """
-        self.fernet = Fernet(key)
+        self.fernet = _make_fernet(key)
+        self.aesgcm = _make_aesgcm(key)
 
     @classmethod
     def from_secret(
-        cls, secret: str, salt: bytes = b"transactions-salt"
+        cls,
+        secret: str,
+        salt: bytes = b"transactions-salt",
+        iterations: int = PBKDF2_ITERATIONS,
     ) -> "Encryptor":
         """
         Derive a secure key from a user-provided secret (password/token).
+        Lower `iterations` only for high-entropy, server-side secrets.
         """
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=480000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(secret.encode()))
-        return cls(key)
+        return cls(_derive_key(secret, salt, iterations))
+
+    @classmethod
+    def from_secrets(
+        cls,
+        pairs: List[Tuple[str, bytes]],
+        iterations: int = PBKDF2_ITERATIONS,
+    ) -> List["Encryptor"]:
+        """
+        Derive several keys at once from (secret, salt) pairs.
+        PBKDF2 is CPU-bound, so derivations run in parallel worker processes.
+        """
+        workers = min(len(pairs), os.cpu_count() or 1)
+        if workers <= 1:
+            return [cls.from_secret(s, salt, iterations) for s, salt in pairs]
+
+        secrets = [s for s, _ in pairs]
+        salts = [salt for _, salt in pairs]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            keys = pool.map(_derive_key, secrets, salts, [iterations] * len(pairs))
+            return [cls(key) for key in keys]
+
+    @classmethod
+    def from_secret_scrypt(
+        cls,
+        secret: str,
+        salt: bytes = b"transactions-salt",
+        n: int = 2**14,
+        r: int = 8,
+        p: int = 1,
+    ) -> "Encryptor":
+        """
+        Derive a key with scrypt, a memory-hard KDF (cheaper CPU per unit of
+        GPU resistance than PBKDF2). Keys differ from from_secret().
+        """
+        return cls(_derive_scrypt_key(secret, salt, n, r, p))
 
     @classmethod
     def generate_key(cls) -> bytes:
@@ -45,3 +133,50 @@ class Encryptor:
         except Exception:
             # Fallback: return original data if decryption fails (migration support)
             return token
+
+    def encrypt_gcm(self, data: str) -> str:
+        """
+        AES-256-GCM in a single pass, returning base64(nonce + ciphertext).
+        Tokens are not interchangeable with encrypt()/decrypt().
+        """
+        if not data:
+            return ""
+        nonce = os.urandom(_GCM_NONCE_SIZE)
+        sealed = self.aesgcm.encrypt(nonce, data.encode(), None)
+        return base64.urlsafe_b64encode(nonce + sealed).decode()
+
+    def decrypt_gcm(self, token: str) -> str:
+        if not token:
+            return ""
+        try:
+            raw = base64.urlsafe_b64decode(token)
+            nonce, sealed = raw[:_GCM_NONCE_SIZE], raw[_GCM_NONCE_SIZE:]
+            return self.aesgcm.decrypt(nonce, sealed, None).decode()
+        except Exception:
+            # Same fallback as decrypt(): hand back data that isn't ours
+            return token
+
+    async def encrypt_async(self, data: str) -> str:
+        """encrypt() off the event loop, for async callers."""
+        return await asyncio.to_thread(self.encrypt, data)
+
+    async def decrypt_async(self, token: str) -> str:
+        """decrypt() off the event loop, for async callers."""
+        return await asyncio.to_thread(self.decrypt, token)
+
+    def _map(self, func, items: List[str]) -> List[str]:
+        # OpenSSL releases the GIL during the cipher calls, so large batches
+        # are spread over a thread pool; small ones stay serial.
+        workers = min(len(items) // _PARALLEL_MIN_ITEMS, os.cpu_count() or 1)
+        if workers <= 1:
+            return [func(v) for v in items]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(func, items))
+
+    def encrypt_many(self, values: List[str]) -> List[str]:
+        """Encrypt several values in one call, reusing the same Fernet context."""
+        return self._map(self.encrypt, values)
+
+    def decrypt_many(self, tokens: List[str]) -> List[str]:
+        """Decrypt several tokens in one call, reusing the same Fernet context."""
+        return self._map(self.decrypt, tokens)